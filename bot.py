@@ -2,8 +2,11 @@ import logging
 import os
 import asyncio
 import re
+import functools
+from dataclasses import dataclass
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
 
 from telegram import (
     Update, 
@@ -21,12 +24,16 @@ from telegram.ext import (
     CallbackQueryHandler,
     ContextTypes,
     ConversationHandler,
+    AIORateLimiter,
+    Defaults,
     filters
 )
-from telegram.error import TelegramError
+from telegram.constants import MessageLimit
+from telegram.error import BadRequest, TelegramError
+from telegram.request import HTTPXRequest
 
 from config import Config
-from database import db
+from database import get_db, ChannelRef
 
 # Configure logging
 logging.basicConfig(
@@ -35,20 +42,244 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Channel IDs look like -1001234567890
+_CHANNEL_ID_RE = re.compile(r"\A-100\d+\Z")
+
+# Telegram user IDs: ASCII digits only, so int() can't reject what this accepts
+_USER_ID_RE = re.compile(r"-?\d+", re.ASCII)
+
+# Settings read on every update, bound once at import
+BOT_TOKEN = Config.BOT_TOKEN
+OWNER_ID = Config.OWNER_ID
+
 # Conversation states
 WAITING_FOR_CHANNEL_ID, WAITING_FOR_POSTS, WAITING_FOR_SCHEDULE = range(3)
 
+# Only these update types are handled, so don't ask Telegram for others
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+# Maximum number of posts being sent at the same time
+SEND_CONCURRENCY = 25
+
+# Media types checked in order, each with a function returning the file_id if present
+_MEDIA_PROBES = (
+    ('photo', lambda m: m.photo[-1].file_id if m.photo else None),
+    ('video', lambda m: m.video.file_id if m.video else None),
+    ('document', lambda m: m.document.file_id if m.document else None),
+)
+
+# Labels for received content, by media type
+_TYPE_LABEL = {
+    'text': "📝 Text",
+    'photo': "🖼️ Photo",
+    'video': "🎥 Video",
+    'document': "📎 Document",
+}
+
+_TYPE_SUMMARY = {
+    'text': lambda post: f"📝 Text (length: {len(post['text'])} chars)",
+    'photo': lambda post: "🖼️ Photo with caption",
+    'video': lambda post: "🎥 Video with caption",
+    'document': lambda post: "📎 Document with caption",
+}
+
+# Static inline keyboards shown while posting
+SEND_OR_SCHEDULE_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🚀 Send Now", callback_data="send_now"),
+        InlineKeyboardButton("⏰ Schedule", callback_data="schedule")
+    ],
+    [InlineKeyboardButton("❌ Cancel", callback_data="cancel_post")]
+])
+
+# For now, simple scheduling options
+SCHEDULE_TIMES_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("⏰ In 1 hour", callback_data="schedule_1"),
+        InlineKeyboardButton("⏰ In 3 hours", callback_data="schedule_3")
+    ],
+    [
+        InlineKeyboardButton("⏰ In 6 hours", callback_data="schedule_6"),
+        InlineKeyboardButton("⏰ In 12 hours", callback_data="schedule_12")
+    ],
+    [
+        InlineKeyboardButton("⏰ Tomorrow same time", callback_data="schedule_24"),
+        InlineKeyboardButton("🚀 Send Now Instead", callback_data="send_now")
+    ],
+    [InlineKeyboardButton("❌ Cancel", callback_data="cancel_post")]
+])
+
+# Static last row of the /list keyboard; only the remove buttons are built per call
+CHANNEL_LIST_CLOSE_ROW = (InlineKeyboardButton("❌ Close", callback_data="cancel"),)
+CHANNEL_LIST_FOOTER = "\n\nClick on any channel to remove it:"
+# Telegram rejects inline keyboards with more than 100 buttons; one is Close
+CHANNEL_LIST_MAX_BUTTONS = 99
+
+# Delay in hours for each SCHEDULE_TIMES_KEYBOARD option
+_SCHEDULE_HOURS = {f"schedule_{hours}": hours for hours in (1, 3, 6, 12, 24)}
+
+# Pending posts found at startup more than this late are expired instead of sent
+SCHEDULE_GRACE_PERIOD = timedelta(hours=1)
+
+# Scheduled posts that fail to send are retried, doubling the delay each time,
+# before they are given up on and the user who scheduled them is told
+SCHEDULE_MAX_ATTEMPTS = 3
+SCHEDULE_RETRY_DELAY = timedelta(minutes=5)
+
+# Bot API method and file argument used to send each media type
+_SEND_DISPATCH = {
+    'photo': ('send_photo', 'photo'),
+    'video': ('send_video', 'video'),
+    'document': ('send_document', 'document'),
+}
+
+# /start greeting, formatted with the user's first name
+WELCOME_TEMPLATE = (
+    "👋 Welcome {name}!\n\n"
+    "📋 **Available Commands:**\n"
+    "/add - Add a post channel\n"
+    "/list - List all channels\n"
+    "/addsudo - Add sudo user\n"
+    "/removesudo - Remove sudo user\n"
+    "/sudo - List sudo users\n"
+    "/post - Start posting to channels\n"
+    "/help - Show this help message\n\n"
+    "Bot developed for channel management"
+)
+
+# Command menu registered with Telegram at startup
+BOT_COMMANDS = [
+    BotCommand("start", "Start the bot"),
+    BotCommand("add", "Add a post channel"),
+    BotCommand("list", "List all channels"),
+    BotCommand("addsudo", "Add sudo user"),
+    BotCommand("removesudo", "Remove sudo user"),
+    BotCommand("sudo", "List sudo users"),
+    BotCommand("post", "Start posting to channels"),
+    BotCommand("cancel", "Cancel current operation"),
+    BotCommand("help", "Show help message"),
+]
+
+@dataclass(slots=True)
+class PostingSession:
+    """State of a /post conversation, stored in context.user_data['session']"""
+    channels: List[ChannelRef]
+    posts: List[Optional[Dict]]
+    required: int
+    received: int = 0
+
+def _truncate(text: str, limit: int) -> str:
+    """Shorten text to limit characters, adding an ellipsis when cut"""
+    return text[:limit] + "..." if len(text) > limit else text
+
+def _utf16_len(text: str) -> int:
+    """Length as Telegram counts it: UTF-16 code units, so emoji count as 2"""
+    return len(text.encode("utf-16-le")) // 2
+
+def _format_sudo_user(index: int, user: Dict) -> str:
+    """Render one entry of the /sudo list"""
+    added_date = user.get('added_date', datetime.now())
+    if isinstance(added_date, datetime):
+        date_str = f"{added_date:%Y-%m-%d %H:%M}"
+    else:
+        date_str = str(added_date)
+    
+    return (
+        f"{index}. **User:** {user.get('username', 'N/A')}\n"
+        f"   **ID:** `{user['user_id']}`\n"
+        f"   **Added by:** {user.get('added_by', 'Unknown')}\n"
+        f"   **Date:** {date_str}\n\n"
+    )
+
+def _render_channel_list(channels: List[ChannelRef], prefix: str = ""):
+    """Build the /list message text and its remove-button keyboard"""
+    header = f"{prefix}📋 **Total Channels: {len(channels)}**\n\n"
+    # Leave room for the "... and N more" line
+    budget = MessageLimit.MAX_TEXT_LENGTH - _utf16_len(header) - _utf16_len(CHANNEL_LIST_FOOTER) - 80
+    
+    # Remove buttons (long channel names truncated), capped at Telegram's keyboard size
+    keyboard = [
+        [InlineKeyboardButton(f"🗑️ {_truncate(ch.channel_title, 30)}", callback_data=f"remove_{ch.channel_id}")]
+        for ch in channels[:CHANNEL_LIST_MAX_BUTTONS]
+    ]
+    
+    # Channel lines, stopping at the first one that would push the message past
+    # Telegram's length limit so the list is cut at the end rather than having gaps
+    parts = []
+    used = 0
+    for ch in channels:
+        line = f"• {ch.channel_title} (`{ch.channel_id}`)"
+        length = _utf16_len(line) + 1
+        if used + length > budget:
+            break
+        parts.append(line)
+        used += length
+    
+    hidden = len(channels) - len(parts)
+    if hidden:
+        parts.append(f"... and {hidden} more")
+    if len(channels) > CHANNEL_LIST_MAX_BUTTONS:
+        parts.append(f"(remove buttons shown for the first {CHANNEL_LIST_MAX_BUTTONS} channels)")
+    
+    keyboard.append(CHANNEL_LIST_CLOSE_ROW)
+    
+    return header + "\n".join(parts) + CHANNEL_LIST_FOOTER, InlineKeyboardMarkup(keyboard)
+
+def requires_auth(handler):
+    """Only run a TelegramBot handler for the owner and sudo users"""
+    @functools.wraps(handler)
+    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not await self._is_authorized(update.effective_user.id):
+            if update.callback_query:
+                await update.callback_query.answer("❌ You are not authorized!", show_alert=True)
+            else:
+                await update.message.reply_text("❌ You are not authorized to use this command!")
+            return ConversationHandler.END
+        return await handler(self, update, context)
+    return wrapper
+
 class TelegramBot:
     def __init__(self):
         # Initialize bot with your token
-        self.token = Config.BOT_TOKEN
+        self.token = BOT_TOKEN
         if not self.token:
             raise ValueError("BOT_TOKEN not found in environment variables!")
         
-        self.application = Application.builder().token(self.token).build()
+        self.db = get_db()
+        
+        # Concurrency limits for outgoing posts: global cap plus one lock per chat
+        self._send_semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+        self._chat_locks: Dict[str, asyncio.Lock] = {}
+        
+        # AIORateLimiter keeps us under Telegram's flood limits (30 msg/s overall,
+        # ~1 msg/s per chat) so broadcasts can be dispatched concurrently.
+        # Updates are processed concurrently and handlers don't block each other,
+        # so a long broadcast doesn't stall other users' commands.
+        # API calls share pooled HTTP/2 connections instead of new HTTP/1.1 ones.
+        self.application = (
+            Application.builder()
+            .token(self.token)
+            .request(HTTPXRequest(http_version="2", connection_pool_size=256, pool_timeout=30))
+            .get_updates_request(HTTPXRequest(http_version="2", connect_timeout=5, read_timeout=15))
+            .concurrent_updates(True)
+            .defaults(Defaults(block=False))
+            .rate_limiter(AIORateLimiter(overall_max_rate=30, overall_time_period=1, max_retries=3))
+            .post_init(self._post_init)
+            .build()
+        )
         self.setup_handlers()
         logger.info("Bot initialized successfully")
 
+    async def _post_init(self, application: Application):
+        """Register the bot command menu and pending scheduled posts once at startup"""
+        await self.db.init_indexes()
+        await application.bot.set_my_commands(BOT_COMMANDS)
+        await self._schedule_pending_posts(application)
+
+    async def _is_authorized(self, user_id: int) -> bool:
+        """Check if user is the owner or a sudo user (served from the database's sudo cache)"""
+        return user_id == OWNER_ID or await self.db.is_sudo_user(user_id)
+
     def setup_handlers(self):
         """Setup all command and message handlers"""
         # Command handlers
@@ -60,21 +291,31 @@ class TelegramBot:
         self.application.add_handler(CommandHandler("removesudo", self.remove_sudo))
         self.application.add_handler(CommandHandler("sudo", self.list_sudo))
         
-        # Callback query handlers
-        self.application.add_handler(CallbackQueryHandler(self.callback_handler, pattern="^(remove_|send_now|schedule|cancel_post).*"))
+        # Callback query handlers (posting callbacks are handled by the conversation)
+        self.application.add_handler(CallbackQueryHandler(self.handle_channel_removal, pattern=r"^remove_"))
+        self.application.add_handler(CallbackQueryHandler(self.close_channel_list, pattern=r"^cancel$"))
         
         # Conversation handler for posting
         conv_handler = ConversationHandler(
             entry_points=[CommandHandler("post", self.post_command)],
             states={
                 WAITING_FOR_POSTS: [
-                    MessageHandler(filters.ALL & ~filters.COMMAND, self.receive_posts)
+                    MessageHandler(
+                        (filters.TEXT | filters.PHOTO | filters.VIDEO | filters.Document.ALL) & ~filters.COMMAND,
+                        self.receive_posts
+                    )
                 ],
                 WAITING_FOR_SCHEDULE: [
-                    CallbackQueryHandler(self.handle_schedule_choice, pattern="^(send_now|schedule|cancel_post)$")
+                    CallbackQueryHandler(self.send_posts_now, pattern=r"^send_now$"),
+                    CallbackQueryHandler(self.ask_schedule_time, pattern=r"^schedule$"),
+                    CallbackQueryHandler(self.cancel_post, pattern=r"^cancel_post$"),
+                    CallbackQueryHandler(self.handle_scheduled_time, pattern=r"^schedule_\d+$")
                 ]
             },
             fallbacks=[CommandHandler("cancel", self.cancel_conversation)],
+            # Overrides Defaults(block=False): a non-blocking state callback leaves the
+            # conversation pending, and the user's next messages would be dropped
+            block=True,
         )
         self.application.add_handler(conv_handler)
         
@@ -84,19 +325,7 @@ class TelegramBot:
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         user = update.effective_user
-        welcome_text = (
-            f"👋 Welcome {user.first_name}!\n\n"
-            "📋 **Available Commands:**\n"
-            "/add - Add a post channel\n"
-            "/list - List all channels\n"
-            "/addsudo - Add sudo user\n"
-            "/removesudo - Remove sudo user\n"
-            "/sudo - List sudo users\n"
-            "/post - Start posting to channels\n"
-            "/help - Show this help message\n\n"
-            "Bot developed for channel management"
-        )
-        await update.message.reply_text(welcome_text, parse_mode='Markdown')
+        await update.message.reply_text(WELCOME_TEMPLATE.format(name=user.first_name), parse_mode='Markdown')
 
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
@@ -123,14 +352,10 @@ class TelegramBot:
         )
         await update.message.reply_text(help_text, parse_mode='Markdown')
 
+    @requires_auth
     async def add_channel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /add command to add channels"""
         user_id = update.effective_user.id
-        
-        # Check if user is sudo or owner
-        if not (db.is_sudo_user(user_id) or user_id == Config.OWNER_ID):
-            await update.message.reply_text("❌ You are not authorized to use this command!")
-            return
 
         if not context.args:
             await update.message.reply_text(
@@ -145,7 +370,7 @@ class TelegramBot:
         channel_id = context.args[0]
         
         # Validate channel ID format
-        if not re.match(r"^-100\d+$", channel_id):
+        if not _CHANNEL_ID_RE.match(channel_id):
             await update.message.reply_text(
                 "❌ Invalid channel ID format!\n"
                 "Channel ID should start with -100 followed by numbers.\n"
@@ -156,9 +381,12 @@ class TelegramBot:
             return
 
         try:
-            # Check if bot is admin in channel
+            # Check bot admin status and fetch channel info in parallel
             bot = context.bot
-            chat_member = await bot.get_chat_member(channel_id, bot.id)
+            chat_member, chat = await asyncio.gather(
+                bot.get_chat_member(channel_id, bot.id),
+                bot.get_chat(channel_id)
+            )
             
             if chat_member.status not in ["administrator", "creator"]:
                 await update.message.reply_text(
@@ -167,18 +395,17 @@ class TelegramBot:
                 )
                 return
             
-            # Get channel info
-            chat = await bot.get_chat(channel_id)
             channel_title = chat.title
             
-            # Check if channel already exists
-            if db.get_channel_by_id(channel_id):
+            # Add to database (left untouched if the channel already exists)
+            result = await self.db.add_channel(channel_id, channel_title, user_id)
+            if result is None:
+                await update.message.reply_text("❌ An unexpected error occurred!")
+                return
+            if result.upserted_id is None:
                 await update.message.reply_text("⚠️ This channel is already added!")
                 return
             
-            # Add to database
-            db.add_channel(channel_id, channel_title, user_id)
-            
             await update.message.reply_text(
                 f"✅ **Channel added successfully!**\n\n"
                 f"📢 **Channel:** {channel_title}\n"
@@ -189,7 +416,7 @@ class TelegramBot:
             )
             
         except TelegramError as e:
-            logger.error(f"Telegram error adding channel: {e}")
+            logger.error("Telegram error adding channel: %s", e)
             await update.message.reply_text(
                 "❌ **Failed to add channel!**\n\n"
                 "**Possible reasons:**\n"
@@ -198,56 +425,31 @@ class TelegramBot:
                 "3. Channel is private and bot not added\n"
                 "4. Bot doesn't have admin permissions"
             )
-        except Exception as e:
-            logger.error(f"Error adding channel: {e}")
+        except Exception:
+            logger.exception("Error adding channel")
             await update.message.reply_text("❌ An unexpected error occurred!")
 
+    @requires_auth
     async def list_channels(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /list command to show all channels"""
-        user_id = update.effective_user.id
-        
-        if not (db.is_sudo_user(user_id) or user_id == Config.OWNER_ID):
-            await update.message.reply_text("❌ You are not authorized to use this command!")
-            return
-
-        channels = db.get_all_channels()
+        channels = await self.db.get_channel_ids_and_titles()
         
         if not channels:
             await update.message.reply_text("📭 No channels added yet! Use `/add` to add channels.", parse_mode='Markdown')
             return
 
-        # Create inline keyboard with remove buttons
-        keyboard = []
-        for channel in channels:
-            # Truncate long channel names
-            display_name = channel['channel_title'][:30] + "..." if len(channel['channel_title']) > 30 else channel['channel_title']
-            button = InlineKeyboardButton(
-                f"🗑️ {display_name}",
-                callback_data=f"remove_{channel['channel_id']}"
-            )
-            keyboard.append([button])
-        
-        # Add a cancel button
-        keyboard.append([InlineKeyboardButton("❌ Close", callback_data="cancel")])
+        # Remember what was shown so removals can update the list without a DB scan
+        context.user_data['last_channel_list'] = channels
         
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        channels_text = "\n".join([f"• {ch['channel_title']} (`{ch['channel_id']}`)" for ch in channels])
-        
-        await update.message.reply_text(
-            f"📋 **Total Channels: {len(channels)}**\n\n"
-            f"{channels_text}\n\n"
-            f"Click on any channel to remove it:",
-            reply_markup=reply_markup,
-            parse_mode='Markdown'
-        )
+        text, reply_markup = _render_channel_list(channels)
+        await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
 
     async def add_sudo(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /addsudo command"""
         user_id = update.effective_user.id
         
         # Only owner can add sudo users
-        if user_id != Config.OWNER_ID:
+        if user_id != OWNER_ID:
             await update.message.reply_text("❌ Only bot owner can add sudo users!")
             return
 
@@ -260,23 +462,37 @@ class TelegramBot:
             )
             return
 
+        # Validate up front instead of relying on int() raising
+        target = context.args[0]
+        if target.startswith("@"):
+            await update.message.reply_text("❌ Pass numeric user ID, not @username.")
+            return
+        if not _USER_ID_RE.fullmatch(target):
+            await update.message.reply_text("❌ Invalid user ID! User ID must be a number.")
+            return
+        target_user_id = int(target)
+
         try:
-            target_user_id = int(context.args[0])
+            # Check if already sudo
+            if await self.db.is_sudo_user(target_user_id):
+                await update.message.reply_text("⚠️ User is already a sudo user!")
+                return
             
             # Check if user exists (try to get user info)
             try:
                 user = await context.bot.get_chat(target_user_id)
                 username = user.username or user.first_name
-            except:
+            except TelegramError:
                 username = str(target_user_id)
             
-            # Check if already sudo
-            if db.is_sudo_user(target_user_id):
+            # Add to database
+            result = await self.db.add_sudo_user(target_user_id, username, user_id)
+            if result is None:
+                await update.message.reply_text("❌ Failed to add sudo user!")
+                return
+            if result.upserted_id is None:
                 await update.message.reply_text("⚠️ User is already a sudo user!")
                 return
-            
-            # Add to database
-            db.add_sudo_user(target_user_id, username, user_id)
             await update.message.reply_text(
                 f"✅ **User added as sudo!**\n\n"
                 f"👤 User: {username}\n"
@@ -285,17 +501,15 @@ class TelegramBot:
                 parse_mode='Markdown'
             )
             
-        except ValueError:
-            await update.message.reply_text("❌ Invalid user ID! User ID must be a number.")
-        except Exception as e:
-            logger.error(f"Error adding sudo: {e}")
+        except Exception:
+            logger.exception("Error adding sudo")
             await update.message.reply_text("❌ Failed to add sudo user!")
 
     async def remove_sudo(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /removesudo command"""
         user_id = update.effective_user.id
         
-        if user_id != Config.OWNER_ID:
+        if user_id != OWNER_ID:
             await update.message.reply_text("❌ Only bot owner can remove sudo users!")
             return
 
@@ -311,72 +525,54 @@ class TelegramBot:
             target_user_id = int(context.args[0])
             
             # Check if user exists in sudo list
-            if not db.is_sudo_user(target_user_id):
+            if not await self.db.is_sudo_user(target_user_id):
                 await update.message.reply_text("⚠️ User is not in sudo list!")
                 return
             
             # Remove from database
-            db.remove_sudo_user(target_user_id)
+            await self.db.remove_sudo_user(target_user_id)
             await update.message.reply_text(f"✅ User `{target_user_id}` removed from sudo!", parse_mode='Markdown')
             
         except ValueError:
             await update.message.reply_text("❌ Invalid user ID! User ID must be a number.")
-        except Exception as e:
-            logger.error(f"Error removing sudo: {e}")
+        except Exception:
+            logger.exception("Error removing sudo")
             await update.message.reply_text("❌ Failed to remove sudo user!")
 
+    @requires_auth
     async def list_sudo(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /sudo command to list all sudo users"""
-        user_id = update.effective_user.id
-        
-        if not (db.is_sudo_user(user_id) or user_id == Config.OWNER_ID):
-            await update.message.reply_text("❌ You are not authorized to use this command!")
-            return
-
-        sudo_users = db.get_all_sudo_users()
+        sudo_users = await self.db.get_all_sudo_users(
+            projection={"user_id": 1, "username": 1, "added_by": 1, "added_date": 1, "_id": 0}
+        )
         
         if not sudo_users:
             await update.message.reply_text("👥 No sudo users added! Use `/addsudo` to add users.", parse_mode='Markdown')
             return
 
-        text = "👑 **Sudo Users List:**\n\n"
-        for i, user in enumerate(sudo_users, 1):
-            username = user.get('username', 'N/A')
-            added_by = user.get('added_by', 'Unknown')
-            added_date = user.get('added_date', datetime.now())
-            
-            if isinstance(added_date, datetime):
-                date_str = added_date.strftime('%Y-%m-%d %H:%M')
-            else:
-                date_str = str(added_date)
-            
-            text += f"{i}. **User:** {username}\n"
-            text += f"   **ID:** `{user['user_id']}`\n"
-            text += f"   **Added by:** {added_by}\n"
-            text += f"   **Date:** {date_str}\n\n"
+        text = "👑 **Sudo Users List:**\n\n" + "".join(
+            _format_sudo_user(i, user) for i, user in enumerate(sudo_users, 1)
+        )
         
         await update.message.reply_text(text, parse_mode='Markdown')
 
+    @requires_auth
     async def post_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /post command to start posting"""
-        user_id = update.effective_user.id
-        
-        if not (db.is_sudo_user(user_id) or user_id == Config.OWNER_ID):
-            await update.message.reply_text("❌ You are not authorized to use this command!")
-            return ConversationHandler.END
-
-        channels = db.get_all_channels()
+        channels = await self.db.get_channel_ids_and_titles()
         
         if not channels:
             await update.message.reply_text("❌ No channels added! Use `/add` first.", parse_mode='Markdown')
             return ConversationHandler.END
 
         # Store channel info in user data
-        context.user_data['channels'] = channels
-        context.user_data['posts_received'] = []
-        context.user_data['channel_count'] = len(channels)
+        context.user_data['session'] = PostingSession(
+            channels=channels,
+            posts=[None] * len(channels),
+            required=len(channels)
+        )
         
-        channel_list = "\n".join([f"{i+1}. {ch['channel_title']}" for i, ch in enumerate(channels)])
+        channel_list = "\n".join([f"{i+1}. {ch.channel_title}" for i, ch in enumerate(channels)])
         
         await update.message.reply_text(
             f"📝 **Posting Setup**\n\n"
@@ -396,13 +592,17 @@ class TelegramBot:
     async def receive_posts(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Receive posts from user"""
         # Check if we're in the right state
-        if 'channels' not in context.user_data:
+        session = context.user_data.get('session')
+        if session is None:
             await update.message.reply_text("❌ Session expired. Use `/post` to start again.", parse_mode='Markdown')
             return ConversationHandler.END
         
-        # Store the post
-        if 'posts_received' not in context.user_data:
-            context.user_data['posts_received'] = []
+        # Don't accept more posts than there are channels
+        required = session.required
+        received = session.received
+        if received >= required:
+            await update.message.reply_text("⚠️ Already collected all posts; choose an option above.")
+            return WAITING_FOR_SCHEDULE
         
         # Store post data
         post_data = {
@@ -415,36 +615,24 @@ class TelegramBot:
         }
         
         # Handle different media types
-        if update.message.photo:
-            post_data['media_type'] = 'photo'
-            post_data['file_id'] = update.message.photo[-1].file_id
-            post_data['has_media'] = True
-        elif update.message.video:
-            post_data['media_type'] = 'video'
-            post_data['file_id'] = update.message.video.file_id
-            post_data['has_media'] = True
-        elif update.message.document:
-            post_data['media_type'] = 'document'
-            post_data['file_id'] = update.message.document.file_id
-            post_data['has_media'] = True
-        elif update.message.text:
-            post_data['media_type'] = 'text'
-            post_data['has_media'] = False
-        
-        context.user_data['posts_received'].append(post_data)
-        
-        received = len(context.user_data['posts_received'])
-        required = context.user_data['channel_count']
+        for media_type, probe in _MEDIA_PROBES:
+            file_id = probe(update.message)
+            if file_id:
+                post_data['media_type'] = media_type
+                post_data['file_id'] = file_id
+                post_data['has_media'] = True
+                break
+        else:
+            if update.message.text:
+                post_data['media_type'] = 'text'
+        
+        session.posts[received] = post_data
+        received += 1
+        session.received = received
         
         if received < required:
             # Show what type of content was received
-            content_type = "📝 Text"
-            if post_data['media_type'] == 'photo':
-                content_type = "🖼️ Photo"
-            elif post_data['media_type'] == 'video':
-                content_type = "🎥 Video"
-            elif post_data['media_type'] == 'document':
-                content_type = "📎 Document"
+            content_type = _TYPE_LABEL.get(post_data['media_type'], "📝 Text")
             
             await update.message.reply_text(
                 f"✅ **Post {received} received!** ({content_type})\n"
@@ -453,85 +641,60 @@ class TelegramBot:
                 parse_mode='Markdown'
             )
             return WAITING_FOR_POSTS
-        elif received == required:
+        else:
             # All posts received, show options
-            keyboard = [
-                [
-                    InlineKeyboardButton("🚀 Send Now", callback_data="send_now"),
-                    InlineKeyboardButton("⏰ Schedule", callback_data="schedule")
-                ],
-                [InlineKeyboardButton("❌ Cancel", callback_data="cancel_post")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
             # Show summary of what was received
-            summary = []
-            for i, post in enumerate(context.user_data['posts_received'], 1):
-                if post['media_type'] == 'text':
-                    summary.append(f"{i}. 📝 Text (length: {len(post['text'])} chars)")
-                elif post['media_type'] == 'photo':
-                    summary.append(f"{i}. 🖼️ Photo with caption")
-                elif post['media_type'] == 'video':
-                    summary.append(f"{i}. 🎥 Video with caption")
-                elif post['media_type'] == 'document':
-                    summary.append(f"{i}. 📎 Document with caption")
-            
-            summary_text = "\n".join(summary)
+            summary_text = "\n".join(
+                f"{i}. {_TYPE_SUMMARY[post['media_type']](post)}"
+                for i, post in enumerate(session.posts, 1)
+            )
             
             await update.message.reply_text(
                 f"✅ **All {required} posts received!**\n\n"
                 f"**Posts Summary:**\n{summary_text}\n\n"
                 f"**Choose an option:**",
-                reply_markup=reply_markup,
+                reply_markup=SEND_OR_SCHEDULE_KEYBOARD,
                 parse_mode='Markdown'
             )
             return WAITING_FOR_SCHEDULE
-        else:
-            await update.message.reply_text("⚠️ You've sent more posts than required!")
-            return WAITING_FOR_POSTS
 
-    async def handle_schedule_choice(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle schedule choice"""
+    async def cancel_post(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Cancel posting from the inline keyboard"""
         query = update.callback_query
         await query.answer()
-        
-        if query.data == "send_now":
-            await self.send_posts_now(update, context)
-        elif query.data == "schedule":
-            await self.ask_schedule_time(update, context)
-        elif query.data == "cancel_post":
-            await query.edit_message_text("❌ Posting cancelled!")
-            return ConversationHandler.END
-        elif query.data == "cancel":
-            await query.message.delete()
+        context.user_data.pop('session', None)
+        await query.edit_message_text("❌ Posting cancelled!")
+        return ConversationHandler.END
 
     async def send_posts_now(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Send posts immediately"""
         query = update.callback_query
+        await query.answer()
         await query.edit_message_text("🚀 **Sending posts to channels...**\n\nPlease wait...", parse_mode='Markdown')
         
-        channels = context.user_data['channels']
-        posts = context.user_data['posts_received']
+        session = context.user_data['session']
+        channels = session.channels
+        posts = session.posts
+        
+        # Send all posts concurrently; the rate limiter paces the requests
+        tasks = [
+            asyncio.create_task(self.send_post_to_channel(context.bot, ch.channel_id, p))
+            for ch, p in zip(channels, posts)
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         
         success_count = 0
         failed_channels = []
         
-        # Send posts one by one
-        for i, (channel, post) in enumerate(zip(channels, posts)):
-            try:
-                success = await self.send_post_to_channel(context.bot, channel['channel_id'], post)
-                if success:
-                    success_count += 1
-                    logger.info(f"Successfully sent post {i+1} to {channel['channel_title']}")
-                else:
-                    failed_channels.append(channel['channel_title'])
-                
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Failed to send to {channel['channel_title']}: {e}")
-                failed_channels.append(channel['channel_title'])
+        for i, ((_, title), result) in enumerate(zip(channels, results)):
+            if isinstance(result, BaseException):
+                logger.error("Failed to send to %s", title, exc_info=result)
+                failed_channels.append(title)
+            elif result:
+                success_count += 1
+                logger.info("Successfully sent post %d to %s", i + 1, title)
+            else:
+                failed_channels.append(title)
         
         # Send report
         report = f"📊 **Posting Report**\n\n"
@@ -542,8 +705,8 @@ class TelegramBot:
             if len(failed_channels) > 5:
                 report += f" and {len(failed_channels) - 5} more..."
         
-        # Clear user data
-        context.user_data.clear()
+        # Clear posting session
+        context.user_data.pop('session', None)
         
         await query.message.reply_text(report, parse_mode='Markdown')
         return ConversationHandler.END
@@ -551,132 +714,111 @@ class TelegramBot:
     async def send_post_to_channel(self, bot, channel_id, post):
         """Send a post to a specific channel"""
         try:
-            if post['media_type'] == 'photo' and post['file_id']:
-                await bot.send_photo(
-                    chat_id=channel_id,
-                    photo=post['file_id'],
-                    caption=post['text'][:1024] if post['text'] else None,
-                    parse_mode='Markdown'
-                )
-            elif post['media_type'] == 'video' and post['file_id']:
-                await bot.send_video(
-                    chat_id=channel_id,
-                    video=post['file_id'],
-                    caption=post['text'][:1024] if post['text'] else None,
-                    parse_mode='Markdown'
-                )
-            elif post['media_type'] == 'document' and post['file_id']:
-                await bot.send_document(
-                    chat_id=channel_id,
-                    document=post['file_id'],
-                    caption=post['text'][:1024] if post['text'] else None,
-                    parse_mode='Markdown'
-                )
-            elif post['text']:
-                await bot.send_message(
-                    chat_id=channel_id,
-                    text=post['text'][:4096],
-                    parse_mode='Markdown'
-                )
-            else:
-                logger.warning(f"No content to send for post: {post}")
-                return False
-            return True
+            # Keep sends to the same chat in order, then bound in-flight sends overall;
+            # taking the chat lock first means a task queued behind a busy chat
+            # doesn't hold one of the global slots while it waits
+            async with self._chat_locks.setdefault(str(channel_id), asyncio.Lock()), self._send_semaphore:
+                # Copy the original message server-side; this keeps its formatting
+                # and works the same for every content type
+                try:
+                    await bot.copy_message(
+                        chat_id=channel_id,
+                        from_chat_id=post['chat_id'],
+                        message_id=post['message_id']
+                    )
+                    return True
+                except BadRequest as e:
+                    if "not found" not in e.message.lower():
+                        raise
+                    logger.info("Original message gone, resending post to %s from stored data", channel_id)
+                
+                method_name, media_key = _SEND_DISPATCH.get(post['media_type'], (None, None))
+                if media_key and post['file_id']:
+                    kwargs = {
+                        media_key: post['file_id'],
+                        'caption': post['text'][:1024] if post['text'] else None
+                    }
+                elif post['text']:
+                    method_name = 'send_message'
+                    kwargs = {'text': post['text'][:4096]}
+                else:
+                    logger.warning("No content to send for post: %s", post)
+                    return False
+                
+                await getattr(bot, method_name)(chat_id=channel_id, parse_mode='Markdown', **kwargs)
+                return True
         except TelegramError as e:
-            logger.error(f"Telegram error sending to {channel_id}: {e}")
+            logger.error("Telegram error sending to %s: %s", channel_id, e)
             return False
-        except Exception as e:
-            logger.error(f"Error sending post to {channel_id}: {e}")
+        except Exception:
+            logger.exception("Error sending post to %s", channel_id)
             return False
 
     async def ask_schedule_time(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Ask for schedule time"""
         query = update.callback_query
-        
-        # For now, implement simple scheduling options
-        keyboard = [
-            [
-                InlineKeyboardButton("⏰ In 1 hour", callback_data="schedule_1"),
-                InlineKeyboardButton("⏰ In 3 hours", callback_data="schedule_3")
-            ],
-            [
-                InlineKeyboardButton("⏰ In 6 hours", callback_data="schedule_6"),
-                InlineKeyboardButton("⏰ In 12 hours", callback_data="schedule_12")
-            ],
-            [
-                InlineKeyboardButton("⏰ Tomorrow same time", callback_data="schedule_24"),
-                InlineKeyboardButton("🚀 Send Now Instead", callback_data="send_now")
-            ],
-            [InlineKeyboardButton("❌ Cancel", callback_data="cancel_post")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        await query.answer()
         
         await query.edit_message_text(
             "⏰ **Schedule Posts**\n\n"
             "Choose when to send the posts:",
-            reply_markup=reply_markup,
+            reply_markup=SCHEDULE_TIMES_KEYBOARD,
             parse_mode='Markdown'
         )
         return WAITING_FOR_SCHEDULE
 
     async def cancel_conversation(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Cancel the conversation"""
-        if context.user_data:
-            context.user_data.clear()
+        context.user_data.pop('session', None)
         
         await update.message.reply_text("❌ **Operation cancelled!**\n\nAll data cleared.", parse_mode='Markdown')
         return ConversationHandler.END
 
-    async def callback_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle callback queries"""
+    async def close_channel_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Delete the /list message when Close is pressed"""
         query = update.callback_query
         await query.answer()
-        
-        # Handle channel removal
-        if query.data.startswith("remove_"):
-            await self.handle_channel_removal(update, context)
-        
-        # Handle post scheduling choices
-        elif query.data.startswith("schedule_"):
-            await self.handle_scheduled_time(update, context)
-        
-        # Handle other callbacks
-        elif query.data in ["send_now", "schedule", "cancel_post", "cancel"]:
-            await self.handle_schedule_choice(update, context)
+        await query.message.delete()
 
+    @requires_auth
     async def handle_channel_removal(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle channel removal callback"""
         query = update.callback_query
         
-        # Check if user is authorized
-        user_id = query.from_user.id
-        if not (db.is_sudo_user(user_id) or user_id == Config.OWNER_ID):
-            await query.message.reply_text("❌ You are not authorized!")
-            return
-        
         channel_id = query.data.replace("remove_", "")
         
         try:
-            # Get channel info before removal
-            channel = db.get_channel_by_id(channel_id)
+            # Get the title before removal; it is the only field needed
+            channel = await self.db.get_channel_by_id(channel_id, projection={"channel_title": 1, "_id": 0})
             if not channel:
                 await query.answer("Channel not found!", show_alert=True)
                 return
             
             # Remove channel from database
-            db.remove_channel(channel_id)
+            await self.db.remove_channel(channel_id)
             
-            # Update message
-            new_text = query.message.text + f"\n\n✅ **Removed:** {channel['channel_title']}"
+            # Update message with the remaining channels from the last /list
+            removed_note = f"✅ **Removed:** {channel['channel_title']}\n\n"
+            last_list = context.user_data.get('last_channel_list')
+            if last_list is None:
+                # No cached list (e.g. after a restart): just drop the buttons
+                new_text, reply_markup = query.message.text + f"\n\n{removed_note}", None
+            else:
+                remaining = [ch for ch in last_list if ch.channel_id != channel_id]
+                context.user_data['last_channel_list'] = remaining
+                if remaining:
+                    new_text, reply_markup = _render_channel_list(remaining, prefix=removed_note)
+                else:
+                    new_text, reply_markup = removed_note + "📭 No channels left.", None
             
             # Update or delete the message
             try:
                 await query.edit_message_text(
                     new_text,
                     parse_mode='Markdown',
-                    reply_markup=None  # Remove buttons
+                    reply_markup=reply_markup
                 )
-            except:
+            except TelegramError:
                 await query.edit_message_text(
                     f"✅ **Channel removed successfully!**\n\n"
                     f"📢 **Channel:** {channel['channel_title']}\n"
@@ -686,54 +828,137 @@ class TelegramBot:
             
             await query.answer(f"Removed {channel['channel_title']}!", show_alert=False)
             
-        except Exception as e:
-            logger.error(f"Error removing channel: {e}")
+        except Exception:
+            logger.exception("Error removing channel")
             await query.answer("Failed to remove channel!", show_alert=True)
 
     async def handle_scheduled_time(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle scheduled time selection"""
         query = update.callback_query
+        await query.answer()
         
-        # Extract hours from callback data (schedule_1, schedule_3, etc.)
-        try:
-            hours = int(query.data.split("_")[1])
-        except:
-            hours = 1
-        
-        await query.edit_message_text(
-            f"⏰ **Posts scheduled!**\n\n"
-            f"Your posts will be sent in {hours} hour{'s' if hours > 1 else ''}.\n"
-            f"Please note: Full scheduling requires additional setup with APScheduler.\n\n"
-            f"For now, posts are marked as scheduled in database.",
-            parse_mode='Markdown'
-        )
+        # Map callback data (schedule_1, schedule_3, etc.) to hours
+        hours = _SCHEDULE_HOURS.get(query.data, 1)
         
-        # Store scheduled post in database
-        channels = context.user_data.get('channels', [])
-        posts = context.user_data.get('posts_received', [])
+        # Store scheduled posts in database so they survive a restart
+        session = context.user_data.pop('session', None)
+        channels = session.channels if session else []
+        posts = session.posts if session else []
         
-        scheduled_time = datetime.now() + timedelta(hours=hours)
+        now = datetime.now(timezone.utc)
+        scheduled_time = now + timedelta(hours=hours)
         
-        for i, (channel, post) in enumerate(zip(channels, posts)):
-            scheduled_post = {
-                'channel_id': channel['channel_id'],
-                'channel_title': channel['channel_title'],
+        scheduled_posts = [
+            {
+                'channel_id': channel.channel_id,
+                'channel_title': channel.channel_title,
                 'post_data': post,
                 'scheduled_time': scheduled_time,
                 'sent': False,
                 'added_by': query.from_user.id,
-                'added_date': datetime.now()
+                'added_date': now
             }
-            db.add_scheduled_post(scheduled_post)
+            for channel, post in zip(channels, posts)
+        ]
         
-        # Clear user data
-        context.user_data.clear()
+        result = await self.db.add_scheduled_posts(scheduled_posts)
+        if result is None:
+            await query.edit_message_text("❌ Failed to schedule posts! Please try again.")
+            return ConversationHandler.END
+        for scheduled_post, post_id in zip(scheduled_posts, result.inserted_ids):
+            scheduled_post['_id'] = post_id
+        
+        # Wake up once at the scheduled time to send the whole batch
+        context.job_queue.run_once(self._send_scheduled_posts, when=timedelta(hours=hours), data=scheduled_posts)
+        
+        await query.edit_message_text(
+            f"⏰ **Posts scheduled!**\n\n"
+            f"Your posts will be sent in {hours} hour{'s' if hours > 1 else ''}.",
+            parse_mode='Markdown'
+        )
         
         return ConversationHandler.END
 
+    async def _send_scheduled_posts(self, context: ContextTypes.DEFAULT_TYPE):
+        """Job callback: send a batch of scheduled posts and mark them as sent"""
+        scheduled_posts = context.job.data
+        
+        results = await asyncio.gather(
+            *(self.send_post_to_channel(context.bot, p['channel_id'], p['post_data']) for p in scheduled_posts),
+            return_exceptions=True
+        )
+        
+        sent_ids = []
+        failed = []
+        for post, result in zip(scheduled_posts, results):
+            if result is True:
+                sent_ids.append(post['_id'])
+            else:
+                logger.error("Failed to send scheduled post to %s", post['channel_title'])
+                failed.append(post)
+        
+        await self.db.mark_posts_as_sent(sent_ids)
+        if not failed:
+            return
+        
+        # The attempt count lives on the document so retries stay bounded across restarts
+        await self.db.increment_send_attempts([p['_id'] for p in failed])
+        for post in failed:
+            post['attempts'] = post.get('attempts', 0) + 1
+        
+        retry = [p for p in failed if p['attempts'] < SCHEDULE_MAX_ATTEMPTS]
+        given_up = [p for p in failed if p['attempts'] >= SCHEDULE_MAX_ATTEMPTS]
+        
+        for attempts, group in groupby(sorted(retry, key=lambda p: p['attempts']), key=lambda p: p['attempts']):
+            delay = SCHEDULE_RETRY_DELAY * 2 ** (attempts - 1)
+            context.job_queue.run_once(self._send_scheduled_posts, when=delay, data=list(group))
+        
+        if given_up:
+            await self.db.mark_posts_as_expired([p['_id'] for p in given_up])
+            await self._notify_unsent_posts(
+                context.bot, given_up, f"after {SCHEDULE_MAX_ATTEMPTS} attempts"
+            )
+
+    async def _schedule_pending_posts(self, application: Application):
+        """Re-create jobs for scheduled posts that were not sent before a restart"""
+        pending = await self.db.get_scheduled_posts(limit=0)
+        now = datetime.now(timezone.utc)
+        
+        # Posts overdue by more than the grace period (e.g. written by older versions
+        # that never sent them) would arrive far too late, so expire them instead
+        expired = [p for p in pending if now - p['scheduled_time'] > SCHEDULE_GRACE_PERIOD]
+        if expired:
+            await self.db.mark_posts_as_expired([p['_id'] for p in expired])
+            logger.warning("Expired %d scheduled posts that are overdue by more than %s",
+                           len(expired), SCHEDULE_GRACE_PERIOD)
+            await self._notify_unsent_posts(
+                application.bot, expired, "because the bot was offline at the scheduled time"
+            )
+        # Sorted by scheduled_time, so the expired posts are the leading ones
+        pending = pending[len(expired):]
+        
+        for scheduled_time, group in groupby(pending, key=lambda p: p['scheduled_time']):
+            delay = max((scheduled_time - now).total_seconds(), 0)
+            application.job_queue.run_once(self._send_scheduled_posts, when=delay, data=list(group))
+        
+        if pending:
+            logger.info("Rescheduled %d pending posts", len(pending))
+
+    async def _notify_unsent_posts(self, bot, posts, reason):
+        """Tell each user who scheduled these posts that they will not be sent"""
+        by_user = groupby(sorted(posts, key=lambda p: p['added_by']), key=lambda p: p['added_by'])
+        for user_id, group in by_user:
+            titles = "\n".join(f"• {p['channel_title']}" for p in group)
+            # Half the limit in characters stays under it in UTF-16 units, even with emoji
+            text = _truncate(f"⚠️ Scheduled posts were not sent {reason}:\n\n{titles}", MessageLimit.MAX_TEXT_LENGTH // 2)
+            try:
+                await bot.send_message(chat_id=user_id, text=text)
+            except TelegramError as e:
+                logger.warning("Could not notify user %s about unsent posts: %s", user_id, e)
+
     async def error_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle errors"""
-        logger.error(f"Exception while handling an update: {context.error}")
+        logger.error("Exception while handling an update", exc_info=context.error)
         
         try:
             # Notify user about error
@@ -750,18 +975,41 @@ class TelegramBot:
     def run(self):
         """Run the bot"""
         logger.info("Starting bot...")
-        self.application.run_polling(
-            drop_pending_updates=True,
-            allowed_updates=Update.ALL_TYPES
-        )
+        
+        # Use uvloop's faster event loop when available (not on Windows)
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+        
+        if Config.WEBHOOK_URL:
+            # Telegram pushes updates to us; the token in the path keeps the URL private
+            self.application.run_webhook(
+                listen="0.0.0.0",
+                port=Config.PORT,
+                url_path=self.token,
+                secret_token=Config.WEBHOOK_SECRET or None,
+                webhook_url=f"{Config.WEBHOOK_URL.rstrip('/')}/{self.token}",
+                drop_pending_updates=True,
+                allowed_updates=ALLOWED_UPDATES
+            )
+        else:
+            # Telegram holds each getUpdates request open for up to POLL_TIMEOUT seconds
+            self.application.run_polling(
+                drop_pending_updates=True,
+                timeout=Config.POLL_TIMEOUT,
+                poll_interval=Config.POLL_INTERVAL,
+                allowed_updates=ALLOWED_UPDATES
+            )
 
 if __name__ == "__main__":
-    # Check for required environment variables
-    required_vars = ['BOT_TOKEN', 'OWNER_ID']
-    missing_vars = [var for var in required_vars if not getattr(Config, var, None)]
+    # Check required configuration before connecting anywhere
+    config_errors = Config.validate()
     
-    if missing_vars:
-        logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
+    if config_errors:
+        for error in config_errors:
+            logger.error("Configuration error: %s", error)
         logger.error("Please check your .env file")
         exit(1)
     
@@ -769,4 +1017,4 @@ if __name__ == "__main__":
         bot = TelegramBot()
         bot.run()
     except Exception as e:
-        logger.error(f"Failed to start bot: {e}")
+        logger.error("Failed to start bot: %s", e)
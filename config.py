@@ -1,42 +1,84 @@
-
 import os
+from dataclasses import dataclass
+from functools import cache
 from dotenv import load_dotenv
 
-load_dotenv()
+# Variables that must come from the environment or .env
+_REQUIRED_ENV = ("BOT_TOKEN", "OWNER_ID", "MONGO_URI")
+
+@cache
+def _load_env():
+    """Load .env into the environment, at most once per process"""
+    # Deployments that already export every required variable have no .env to parse
+    if not all(os.getenv(name) for name in _REQUIRED_ENV):
+        load_dotenv()
+
+def _parse_owner_id(value):
+    """Return OWNER_ID as an int, or 0 if unset or not numeric (reported by validate())"""
+    try:
+        return int(value.strip())
+    except ValueError:
+        return 0
 
-class Config:
+@dataclass(frozen=True)
+class Settings:
     # Telegram Bot Token
-    BOT_TOKEN = os.getenv("BOT_TOKEN", "8446660054:AAEZbyTPJtZbe7XdIMJJc5w8Pk2Har0P5QE")
-    
+    BOT_TOKEN: str
+
     # MongoDB Configuration
-    MONGO_URI = os.getenv("MONGO_URI", "mongodb+srv://6:6@cluster0.ne91zzc.mongodb.net/?appName=Cluster0")
-    DATABASE_NAME = os.getenv("DATABASE_NAME", "telegram_bot_db")
-    
+    MONGO_URI: str
+    DATABASE_NAME: str
+
     # Bot Owner ID (for initial setup)
-    OWNER_ID = int(os.getenv("OWNER_ID", "6872968794"))
-    
+    OWNER_ID: int
+
     # Timezone for scheduling
-    TIMEZONE = os.getenv("TIMEZONE", "UTC")
-    
-    # Maximum channels that can be added
-    MAX_CHANNELS = 100
-    
+    TIMEZONE: str
+
     # Logging level
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    
+    LOG_LEVEL: str
+
     # Webhook settings (for production)
-    WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")
-    PORT = int(os.getenv("PORT", 8443))
-    
+    WEBHOOK_URL: str
+    WEBHOOK_SECRET: str
+    PORT: int
+
+    # Long polling settings (used when WEBHOOK_URL is not set)
+    POLL_TIMEOUT: int
+    POLL_INTERVAL: float
+
+    # Maximum channels that can be added
+    MAX_CHANNELS: int = 100
+
     @classmethod
-    def validate(cls):
+    def from_env(cls):
+        """Build settings from environment variables (and .env, if present)"""
+        _load_env()
+        return cls(
+            BOT_TOKEN=os.getenv("BOT_TOKEN", ""),
+            MONGO_URI=os.getenv("MONGO_URI", "mongodb://localhost:27017"),
+            DATABASE_NAME=os.getenv("DATABASE_NAME", "telegram_bot_db"),
+            OWNER_ID=_parse_owner_id(os.getenv("OWNER_ID", "")),
+            TIMEZONE=os.getenv("TIMEZONE", "UTC"),
+            LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
+            WEBHOOK_URL=os.getenv("WEBHOOK_URL", ""),
+            WEBHOOK_SECRET=os.getenv("WEBHOOK_SECRET", ""),
+            PORT=int(os.getenv("PORT", 8443)),
+            POLL_TIMEOUT=int(os.getenv("POLL_TIMEOUT", 20)),
+            POLL_INTERVAL=float(os.getenv("POLL_INTERVAL", 0)),
+        )
+
+    def validate(self):
         """Validate required configuration"""
         errors = []
-        
-        if not cls.BOT_TOKEN:
+
+        if not self.BOT_TOKEN:
             errors.append("BOT_TOKEN is required")
-        
-        if cls.OWNER_ID == 0:
+
+        if self.OWNER_ID == 0:
             errors.append("OWNER_ID is required and must be a number")
-        
+
         return errors
+
+# Read once at import; everything else uses these frozen values
+Config = Settings.from_env()
@@ -1,28 +1,93 @@
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import ConnectionFailure, OperationFailure
 from config import Config
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import NamedTuple
 import logging
+import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Marker stored in the _meta collection once indexes and migrations have run;
+# bump it when either changes so existing deployments pick the change up
+INDEXES_VERSION = "indexes_v1"
+
+# How long the cached sudo user set stays valid (seconds)
+SUDO_CACHE_TTL = 30
+
+# After a failed refresh, wait this long before querying again (seconds)
+SUDO_CACHE_RETRY = 5
+
+class ChannelRef(NamedTuple):
+    """Lightweight channel record with only the fields needed for posting"""
+    channel_id: str
+    channel_title: str
+
 class Database:
     def __init__(self):
+        # Motor connects lazily, so nothing here touches the network.
+        # Pool sizing: room for bursts of concurrent updates, a few warm
+        # connections kept open, idle ones closed after 5 minutes, and callers
+        # fail after 2s instead of queueing forever when the pool is exhausted.
+        self.client = AsyncIOMotorClient(
+            Config.MONGO_URI,
+            maxPoolSize=200,
+            minPoolSize=10,
+            maxIdleTimeMS=300_000,
+            waitQueueTimeoutMS=2000,
+            serverSelectionTimeoutMS=5000,
+            tz_aware=True,
+            retryWrites=True
+        )
+        self.db = self.client[Config.DATABASE_NAME]
+        self.channels = self.db["channels"]
+        self.sudo_users = self.db["sudo_users"]
+        self.scheduled_posts = self.db["scheduled_posts"]
+        self.meta = self.db["_meta"]
+        self._indexed = False
+        
+        # In-process cache of sudo user IDs, refreshed every SUDO_CACHE_TTL seconds
+        # and updated directly when sudo users are added or removed
+        self._sudo_cache: set[int] = set()
+        self._sudo_cache_ts = 0.0
+        # Bumped on every add/remove so a refresh that overlapped one is discarded
+        self._sudo_cache_gen = 0
+
+    async def init_indexes(self):
+        """Check the connection and create indexes on first run; later calls are no-ops"""
+        if self._indexed:
+            return
+        
         try:
-            self.client = MongoClient(Config.MONGO_URI, serverSelectionTimeoutMS=5000)
-            self.db = self.client[Config.DATABASE_NAME]
-            self.channels = self.db["channels"]
-            self.sudo_users = self.db["sudo_users"]
-            self.scheduled_posts = self.db["scheduled_posts"]
+            # Test connection
+            await self.client.admin.command('ping')
             
-            # Create indexes
-            self.channels.create_index("channel_id", unique=True)
-            self.sudo_users.create_index("user_id", unique=True)
-            self.scheduled_posts.create_index("scheduled_time")
+            # Indexes and migrations only need to run once per database
+            if await self.meta.find_one({"_id": INDEXES_VERSION}) is None:
+                await self.channels.create_index("channel_id", unique=True)
+                await self.sudo_users.create_index("user_id", unique=True)
+                # Serves get_scheduled_posts: filter on sent, ordered by scheduled_time
+                await self.scheduled_posts.create_index([("sent", 1), ("scheduled_time", 1)])
+                try:
+                    # Superseded by the compound index above
+                    await self.scheduled_posts.drop_index("scheduled_time_1")
+                except OperationFailure:
+                    pass
+                
+                # Channels used to carry a soft-delete "active" flag; drop it
+                await self.channels.delete_many({"active": False})
+                await self.channels.update_many({"active": {"$exists": True}}, {"$unset": {"active": ""}})
+                
+                await self.meta.update_one(
+                    {"_id": INDEXES_VERSION},
+                    {"$currentDate": {"applied_date": True}},
+                    upsert=True
+                )
+                logger.info(f"Database indexes created ({INDEXES_VERSION})")
             
-            # Test connection
-            self.client.admin.command('ping')
+            self._indexed = True
             logger.info("✅ Database connection established successfully")
             
         except ConnectionFailure as e:
@@ -33,126 +98,229 @@ class Database:
             raise
 
     # Channel Management
-    def add_channel(self, channel_id, channel_title, added_by):
+    async def add_channel(self, channel_id, channel_title, added_by):
+        """Insert the channel unless it exists; result.upserted_id is None if it already did"""
         try:
             channel_data = {
-                "channel_id": str(channel_id),
                 "channel_title": str(channel_title),
                 "added_by": added_by,
-                "added_date": datetime.utcnow(),
-                "active": True
+                "added_date": datetime.now(timezone.utc)
             }
-            result = self.channels.insert_one(channel_data)
-            logger.info(f"Channel added: {channel_title} ({channel_id})")
+            result = await self.channels.update_one(
+                {"channel_id": str(channel_id)},
+                {"$setOnInsert": channel_data},
+                upsert=True
+            )
+            if result.upserted_id is not None:
+                logger.info(f"Channel added: {channel_title} ({channel_id})")
             return result
         except Exception as e:
             logger.error(f"Error adding channel: {e}")
             return None
 
-    def get_all_channels(self):
+    async def get_all_channels(self, projection=None):
         try:
-            return list(self.channels.find({"active": True}).sort("added_date", -1))
+            return await self.channels.find({}, projection).sort("added_date", -1).to_list(length=None)
         except Exception as e:
             logger.error(f"Error getting channels: {e}")
             return []
 
-    def get_channel_count(self):
+    async def iter_channels(self, projection=None, batch_size=200):
+        """Stream channels newest first, fetching batch_size documents per round-trip"""
+        cursor = self.channels.find({}, projection, batch_size=batch_size).sort("added_date", -1)
+        async for channel in cursor:
+            yield channel
+
+    async def get_channel_ids_and_titles(self):
         try:
-            return self.channels.count_documents({"active": True})
+            return [
+                ChannelRef(ch["channel_id"], ch["channel_title"])
+                async for ch in self.iter_channels(projection={"channel_id": 1, "channel_title": 1, "_id": 0})
+            ]
+        except Exception as e:
+            logger.error(f"Error getting channel ids: {e}")
+            return []
+
+    async def get_channel_count(self):
+        try:
+            # Channels are hard-deleted, so the collection metadata count is exact
+            # without scanning documents
+            return await self.channels.estimated_document_count()
         except Exception as e:
             logger.error(f"Error counting channels: {e}")
             return 0
 
-    def remove_channel(self, channel_id):
+    async def remove_channel(self, channel_id):
         try:
-            result = self.channels.delete_one({"channel_id": str(channel_id)})
+            result = await self.channels.delete_one({"channel_id": str(channel_id)})
             logger.info(f"Channel removed: {channel_id}")
             return result
         except Exception as e:
             logger.error(f"Error removing channel: {e}")
             return None
 
-    def get_channel_by_id(self, channel_id):
+    async def get_channel_by_id(self, channel_id, projection=None):
         try:
-            return self.channels.find_one({"channel_id": str(channel_id)})
+            return await self.channels.find_one({"channel_id": str(channel_id)}, projection)
         except Exception as e:
             logger.error(f"Error getting channel: {e}")
             return None
 
     # Sudo Users Management
-    def add_sudo_user(self, user_id, username, added_by):
+    async def add_sudo_user(self, user_id, username, added_by):
+        """Insert the sudo user unless it exists; result.upserted_id is None if it already did"""
         try:
             sudo_data = {
-                "user_id": user_id,
                 "username": str(username),
                 "added_by": added_by,
-                "added_date": datetime.utcnow()
+                "added_date": datetime.now(timezone.utc)
             }
-            result = self.sudo_users.insert_one(sudo_data)
-            logger.info(f"Sudo user added: {username} ({user_id})")
+            result = await self.sudo_users.update_one(
+                {"user_id": user_id},
+                {"$setOnInsert": sudo_data},
+                upsert=True
+            )
+            self._sudo_cache.add(user_id)
+            self._invalidate_sudo_cache()
+            if result.upserted_id is not None:
+                logger.info(f"Sudo user added: {username} ({user_id})")
             return result
         except Exception as e:
             logger.error(f"Error adding sudo user: {e}")
             return None
 
-    def remove_sudo_user(self, user_id):
+    async def remove_sudo_user(self, user_id):
         try:
-            result = self.sudo_users.delete_one({"user_id": user_id})
+            result = await self.sudo_users.delete_one({"user_id": user_id})
+            self._sudo_cache.discard(user_id)
+            self._invalidate_sudo_cache()
             logger.info(f"Sudo user removed: {user_id}")
             return result
         except Exception as e:
             logger.error(f"Error removing sudo user: {e}")
             return None
 
-    def get_all_sudo_users(self):
+    async def get_all_sudo_users(self, projection=None):
         try:
-            return list(self.sudo_users.find().sort("added_date", -1))
+            return await self.sudo_users.find({}, projection).sort("added_date", -1).to_list(length=None)
         except Exception as e:
             logger.error(f"Error getting sudo users: {e}")
             return []
 
-    def is_sudo_user(self, user_id):
-        try:
-            return self.sudo_users.find_one({"user_id": user_id}) is not None
-        except Exception as e:
-            logger.error(f"Error checking sudo user: {e}")
-            return False
+    def _invalidate_sudo_cache(self):
+        """Force a refresh on the next check and discard any refresh already in flight"""
+        self._sudo_cache_gen += 1
+        self._sudo_cache_ts = 0.0
+
+    async def is_sudo_user(self, user_id):
+        if time.monotonic() - self._sudo_cache_ts > SUDO_CACHE_TTL:
+            generation = self._sudo_cache_gen
+            try:
+                cursor = self.sudo_users.find({}, {"user_id": 1, "_id": 0})
+                user_ids = {user["user_id"] async for user in cursor}
+            except Exception as e:
+                # Keep answering from the previous set, and back off instead of
+                # waiting on the server on every check while it is unreachable
+                logger.error(f"Error refreshing sudo users: {e}")
+                self._sudo_cache_ts = time.monotonic() - SUDO_CACHE_TTL + SUDO_CACHE_RETRY
+            else:
+                # A sudo user added or removed during the read may be missing from
+                # it; keep the current set and let the next check refresh again
+                if generation == self._sudo_cache_gen:
+                    self._sudo_cache = user_ids
+                    self._sudo_cache_ts = time.monotonic()
+        return user_id in self._sudo_cache
 
     # Scheduled Posts Management
-    def add_scheduled_post(self, post_data):
+    async def add_scheduled_post(self, post_data):
         try:
-            result = self.scheduled_posts.insert_one(post_data)
+            result = await self.scheduled_posts.insert_one(post_data)
             logger.info(f"Scheduled post added: {post_data.get('channel_title')}")
             return result
         except Exception as e:
             logger.error(f"Error adding scheduled post: {e}")
             return None
 
-    def get_scheduled_posts(self, limit=100):
+    async def add_scheduled_posts(self, posts):
+        """Insert several scheduled posts in a single round-trip; returns the InsertManyResult"""
+        if not posts:
+            return None
         try:
-            return list(self.scheduled_posts.find({"sent": False})
-                       .sort("scheduled_time", 1)
-                       .limit(limit))
+            # insert_many would add _id to the dicts in place; callers read inserted_ids
+            result = await self.scheduled_posts.insert_many([dict(post) for post in posts])
+            logger.info(f"Scheduled posts added: {len(result.inserted_ids)}")
+            return result
+        except Exception as e:
+            logger.error(f"Error adding scheduled posts: {e}")
+            return None
+
+    async def get_scheduled_posts(self, limit=100):
+        try:
+            return await (self.scheduled_posts.find({"sent": False, "expired": {"$ne": True}})
+                          .sort("scheduled_time", 1)
+                          .limit(limit)
+                          .to_list(length=None))
         except Exception as e:
             logger.error(f"Error getting scheduled posts: {e}")
             return []
 
-    def mark_post_as_sent(self, post_id):
+    async def mark_post_as_sent(self, post_id):
         try:
-            return self.scheduled_posts.update_one(
+            return await self.scheduled_posts.update_one(
                 {"_id": post_id},
-                {"$set": {"sent": True, "sent_date": datetime.utcnow()}}
+                {"$set": {"sent": True}, "$currentDate": {"sent_date": True}}
             )
         except Exception as e:
             logger.error(f"Error marking post as sent: {e}")
             return None
 
-    def delete_scheduled_post(self, post_id):
+    async def mark_posts_as_sent(self, post_ids):
+        """Mark several scheduled posts as sent in a single round-trip"""
+        if not post_ids:
+            return None
+        try:
+            return await self.scheduled_posts.update_many(
+                {"_id": {"$in": list(post_ids)}},
+                {"$set": {"sent": True}, "$currentDate": {"sent_date": True}}
+            )
+        except Exception as e:
+            logger.error(f"Error marking posts as sent: {e}")
+            return None
+
+    async def increment_send_attempts(self, post_ids):
+        """Count one more failed send for each of these scheduled posts"""
+        if not post_ids:
+            return None
+        try:
+            return await self.scheduled_posts.update_many(
+                {"_id": {"$in": list(post_ids)}},
+                {"$inc": {"attempts": 1}}
+            )
+        except Exception as e:
+            logger.error(f"Error updating send attempts: {e}")
+            return None
+
+    async def mark_posts_as_expired(self, post_ids):
+        """Flag scheduled posts that will never be sent so they are no longer pending"""
+        if not post_ids:
+            return None
+        try:
+            return await self.scheduled_posts.update_many(
+                {"_id": {"$in": list(post_ids)}},
+                {"$set": {"expired": True}}
+            )
+        except Exception as e:
+            logger.error(f"Error marking posts as expired: {e}")
+            return None
+
+    async def delete_scheduled_post(self, post_id):
         try:
-            return self.scheduled_posts.delete_one({"_id": post_id})
+            return await self.scheduled_posts.delete_one({"_id": post_id})
         except Exception as e:
             logger.error(f"Error deleting scheduled post: {e}")
             return None
 
-# Global database instance
-db = Database()
+@lru_cache(maxsize=1)
+def get_db():
+    """Return the process-wide Database, creating its client on first use"""
+    return Database()